@@ -13,6 +13,13 @@ ACAT_REFERENCE_FILE = os.getenv(
 ENDOFLIFE_API_BASE_URL = "https://endoflife.date/api"
 ENDOFLIFE_API_TIMEOUT = 30
 ENDOFLIFE_API_RETRIES = 3
+ENDOFLIFE_MAX_CONCURRENCY = 8  # parallel lookups per batch call
+ENDOFLIFE_CACHE_DIR = Path(os.getenv(
+    "ENDOFLIFE_CACHE_DIR",
+    Path.home() / ".cache" / "acat-mcp" / "eol"
+)).expanduser()
+ENDOFLIFE_CACHE_TTL = 24 * 60 * 60  # seconds a successful response stays fresh
+ENDOFLIFE_NOT_FOUND_CACHE_TTL = 60 * 60  # shorter TTL so unknown products are retried sooner
 RATE_LIMIT_DELAY = 0.5  # seconds between API calls
 
 # Logging
@@ -1,6 +1,9 @@
 """Main MCP Server for ACAT Datastore Service."""
 import asyncio
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Any
@@ -12,20 +15,37 @@ from mcp import types
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import ACAT_REFERENCE_FILE, ENDOFLIFE_API_TIMEOUT, ENDOFLIFE_API_RETRIES, LOG_LEVEL
-from tools.get_acat_reference import get_acat_reference as get_acat_ref_func
+from config import (
+    ACAT_REFERENCE_FILE, ENDOFLIFE_API_TIMEOUT, ENDOFLIFE_API_RETRIES, ENDOFLIFE_MAX_CONCURRENCY,
+    ENDOFLIFE_CACHE_DIR, ENDOFLIFE_CACHE_TTL, ENDOFLIFE_NOT_FOUND_CACHE_TTL, LOG_LEVEL
+)
+from tools.get_acat_reference import get_acat_reference_serialized as get_acat_ref_serialized_func
 from tools.endoflife_lookup import endoflife_lookup as eol_lookup_func
+from tools.endoflife_lookup import endoflife_lookup_many as eol_lookup_many_func
+from tools.endoflife_lookup import configure_cache as configure_eol_cache
 
+# Log through a queue so tool handlers never block on file/stderr writes;
+# a background listener thread does the actual I/O.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.FileHandler('mcp_server.log'), logging.StreamHandler(sys.stderr)
+)
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('mcp_server.log'), logging.StreamHandler(sys.stderr)]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 app = Server("acat-datastore-service")
 
 
+def _text(payload: dict[str, Any]) -> types.TextContent:
+    """Serialize a tool response as JSON text content."""
+    return types.TextContent(type="text", text=json.dumps(payload, default=str))
+
+
 @app.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools."""
@@ -59,6 +79,34 @@ async def handle_list_tools() -> list[types.Tool]:
                 },
                 "required": ["product", "version"]
             }
+        ),
+        types.Tool(
+            name="end_of_life_lookup_batch",
+            description=(
+                "Batch version of end_of_life_lookup: queries endoflife.date for several datastores in one call.\n\n"
+                "PREFER THIS TOOL over repeated end_of_life_lookup calls when more than one datastore needs "
+                "EOL information - lookups run concurrently on the server and return in a single response.\n\n"
+                "Results are returned in the same order as the input items, each with the same structure "
+                "as an end_of_life_lookup result."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "Datastores to look up",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "product": {"type": "string", "description": "Product name (e.g., 'PostgreSQL')"},
+                                "version": {"type": "string", "description": "Version number (e.g., '14')"}
+                            },
+                            "required": ["product", "version"]
+                        }
+                    }
+                },
+                "required": ["items"]
+            }
         )
     ]
 
@@ -70,39 +118,65 @@ async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[
         logger.info(f"Tool called: {name} with arguments: {arguments}")
         
         if name == "get_acat_reference":
-            result = get_acat_ref_func(Path(ACAT_REFERENCE_FILE))
-            return [types.TextContent(type="text", text=str(result))]
+            # The reference list is serialized once and reused while the file is unchanged
+            text = get_acat_ref_serialized_func(Path(ACAT_REFERENCE_FILE))
+            return [types.TextContent(type="text", text=text)]
             
         elif name == "end_of_life_lookup":
             if not arguments:
-                return [types.TextContent(type="text", text=str({
+                return [_text({
                     "status": "error",
                     "error_type": "INVALID_INPUT",
                     "error_message": "Arguments required: product and version"
-                }))]
+                })]
             
-            result = eol_lookup_func(
+            # Run the blocking HTTP lookup off the event loop so concurrent
+            # tool calls from the agent overlap instead of queueing
+            result = await asyncio.to_thread(
+                eol_lookup_func,
                 product=arguments.get("product", ""),
                 version=arguments.get("version", ""),
                 timeout=ENDOFLIFE_API_TIMEOUT,
                 max_retries=ENDOFLIFE_API_RETRIES
             )
-            return [types.TextContent(type="text", text=str(result))]
+            return [_text(result)]
+            
+        elif name == "end_of_life_lookup_batch":
+            items = (arguments or {}).get("items")
+            if not isinstance(items, list):
+                return [_text({
+                    "status": "error",
+                    "error_type": "INVALID_INPUT",
+                    "error_message": "Argument required: items (list of {product, version})"
+                })]
+            
+            # Run the blocking HTTP lookups off the event loop
+            results = await asyncio.to_thread(
+                eol_lookup_many_func,
+                items,
+                timeout=ENDOFLIFE_API_TIMEOUT,
+                max_retries=ENDOFLIFE_API_RETRIES,
+                max_concurrency=ENDOFLIFE_MAX_CONCURRENCY
+            )
+            return [_text({
+                "results": results,
+                "total_count": len(results)
+            })]
             
         else:
-            return [types.TextContent(type="text", text=str({
+            return [_text({
                 "status": "error",
                 "error_type": "UNKNOWN_TOOL",
                 "error_message": f"Tool '{name}' not found"
-            }))]
+            })]
             
     except Exception as e:
         logger.error(f"Error handling tool call: {e}", exc_info=True)
-        return [types.TextContent(type="text", text=str({
+        return [_text({
             "status": "error",
             "error_type": "SERVER_ERROR",
             "error_message": str(e)
-        }))]
+        })]
 
 
 async def main():
@@ -111,6 +185,9 @@ async def main():
     logger.info(f"ACAT Reference File: {ACAT_REFERENCE_FILE}")
     logger.info("Server is reactive - data loaded only when tools are called")
     
+    configure_eol_cache(ENDOFLIFE_CACHE_DIR, ENDOFLIFE_CACHE_TTL, ENDOFLIFE_NOT_FOUND_CACHE_TTL)
+    logger.info(f"endoflife.date cache: {ENDOFLIFE_CACHE_DIR}")
+    
     async with stdio_server() as (read_stream, write_stream):
         logger.info("MCP Server running on stdio transport")
         await app.run(
@@ -135,3 +212,5 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Server error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        _log_listener.stop()
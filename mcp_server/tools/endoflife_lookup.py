@@ -1,12 +1,95 @@
 """Tool 2: endoflife_lookup - Query endoflife.date API for version and EOL information."""
+import functools
+import json
 import logging
+import os
 import time
 import re
-from typing import Dict, Any, Optional, Tuple
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so every lookup reuses the pooled keep-alive connection
+# to endoflife.date instead of paying a fresh TCP + TLS handshake. Created on
+# first use so that importing this module (e.g. for list_tools) stays cheap.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    """Return the shared requests.Session, creating it on first use."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=16))
+            session.headers.update({"User-Agent": "acat-mcp/1.0", "Accept": "application/json"})
+            _SESSION = session
+    return _SESSION
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces outgoing API requests."""
+    
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate  # tokens added per second
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until it becomes available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserve the token now so concurrent callers queue up behind us
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+# Client-side rate limit shared by all lookups: 2 requests/s with bursts of 4
+_BUCKET = TokenBucket(capacity=4, rate=2.0)
+
+# Persistent cache of endoflife.date responses, one JSON file per API product.
+# Defaults for direct use; the server applies its config via configure_cache()
+CACHE_DIR = Path.home() / ".cache" / "acat-mcp" / "eol"
+CACHE_TTL = 24 * 60 * 60
+NOT_FOUND_CACHE_TTL = 60 * 60
+
+# Fields of each endoflife.date cycle record that endoflife_lookup uses
+_RECORD_FIELDS = ("cycle", "eol", "support", "lts", "releaseDate")
+
+# In-process layer on top of the disk cache: api_product -> cache entry
+_memory_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def configure_cache(cache_dir: Path, ttl: float, not_found_ttl: float) -> None:
+    """Set where endoflife.date responses are cached and how long they stay fresh.
+    
+    Args:
+        cache_dir: Directory for the per-product JSON cache files
+        ttl: Seconds a successful response stays fresh
+        not_found_ttl: Seconds an unknown-product response stays fresh
+    """
+    global CACHE_DIR, CACHE_TTL, NOT_FOUND_CACHE_TTL
+    cache_dir = Path(cache_dir)
+    if cache_dir != CACHE_DIR:
+        _memory_cache.clear()
+    CACHE_DIR = cache_dir
+    CACHE_TTL = ttl
+    NOT_FOUND_CACHE_TTL = not_found_ttl
+
 # Product name mapping: ACAT name -> endoflife.date API product ID
 PRODUCT_MAP = {
     # Databases
@@ -85,27 +168,61 @@ PRODUCT_MAP = {
 }
 
 
+# Case-insensitive view of PRODUCT_MAP, built once at import
+_PRODUCT_MAP_CI = {key.lower(): value for key, value in PRODUCT_MAP.items()}
+
+_SUFFIX_RE = re.compile(r'\s+(Database|Server|DB)$', re.IGNORECASE)
+
+# One alternation over every known name (longest first) to spot known products
+# inside a longer input, e.g. "Microsoft SQL Server Enterprise" -> "microsoft sql server"
+_PRODUCT_NAME_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(key) for key in sorted(_PRODUCT_MAP_CI, key=len, reverse=True)) + r')\b'
+)
+
+# Version clean-up patterns used by normalize_version
+_VER_X_RE = re.compile(r'[.\-]x$')
+_VER_LOG_RE = re.compile(r'-log$', re.IGNORECASE)
+_VER_EDITION_RE = re.compile(r'\s+(SP\d+|R\d+|Enterprise|Standard|Express|Developer).*$', re.IGNORECASE)
+
+
+# Cheap sanity checks applied before any API call: a product must normalize to a
+# mapped endoflife.date product or to something shaped like an API slug
+_KNOWN_API_PRODUCTS = frozenset(PRODUCT_MAP.values())
+_PRODUCT_OK = re.compile(r'^[a-z][a-z0-9.+\-]{1,40}$')
+_VERSION_OK = re.compile(r'^\d+(\.\d+){0,3}[A-Za-z0-9.\-]*$')
+
+
+@functools.lru_cache(maxsize=2048)
 def normalize_product_name(product: str) -> Optional[str]:
     """Normalize product name to endoflife.date API format."""
     if product in PRODUCT_MAP:
         return PRODUCT_MAP[product]
     
-    for key, value in PRODUCT_MAP.items():
-        if key.lower() == product.lower():
-            return value
+    api_product = _PRODUCT_MAP_CI.get(product.lower())
+    if api_product:
+        return api_product
+    
+    cleaned = _SUFFIX_RE.sub('', product)
+    if cleaned != product:
+        api_product = _PRODUCT_MAP_CI.get(cleaned.lower())
+        if api_product:
+            return api_product
     
-    cleaned = re.sub(r'\s+(Database|Server|DB)$', '', product, flags=re.IGNORECASE)
-    if cleaned != product and cleaned in PRODUCT_MAP:
-        return PRODUCT_MAP[cleaned]
+    # Only trust embedded names that all agree on one product; inputs naming
+    # several products ("MySQL 5.0, PostgreSQL 14") fall through to the slug
+    hits = {_PRODUCT_MAP_CI[m.group(1)] for m in _PRODUCT_NAME_RE.finditer(product.lower())}
+    if len(hits) == 1:
+        return hits.pop()
     
     return product.lower().replace(' ', '-')
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_version(version: str) -> str:
     """Normalize version string."""
-    version = re.sub(r'[.\-]x$', '', version)
-    version = re.sub(r'-log$', '', version, flags=re.IGNORECASE)
-    version = re.sub(r'\s+(SP\d+|R\d+|Enterprise|Standard|Express|Developer).*$', '', version, flags=re.IGNORECASE)
+    version = _VER_X_RE.sub('', version)
+    version = _VER_LOG_RE.sub('', version)
+    version = _VER_EDITION_RE.sub('', version)
     
     parts = version.split('.')
     if len(parts) > 1:
@@ -114,6 +231,17 @@ def normalize_version(version: str) -> str:
     return version.strip()
 
 
+def _version_key(version: str) -> int:
+    """Convert a "major.minor" version to an integer that orders correctly.
+    
+    Unlike a float, this keeps 1.10 distinct from (and above) 1.1.
+    Raises ValueError for non-numeric versions.
+    """
+    parts = str(version).split('.')
+    minor = int(parts[1]) if len(parts) > 1 else 0
+    return int(parts[0]) * 1000 + minor
+
+
 def find_closest_version(target_version: str, available_versions: list) -> Tuple[Optional[str], str]:
     """Find the closest matching version from available versions."""
     if not available_versions:
@@ -130,41 +258,196 @@ def find_closest_version(target_version: str, available_versions: list) -> Tuple
             return version, "MAJOR"
     
     try:
-        target_float = float(target_parts[0]) + (float(target_parts[1]) / 100 if len(target_parts) > 1 else 0)
-        
-        version_floats = []
-        for v in available_versions:
-            v_parts = str(v).split('.')
-            v_float = float(v_parts[0]) + (float(v_parts[1]) / 100 if len(v_parts) > 1 else 0)
-            version_floats.append((v, v_float))
-        
-        closest = min(version_floats, key=lambda x: abs(x[1] - target_float))
-        return closest[0], "CLOSEST"
+        target_key = _version_key(target_version)
+        closest = min(available_versions, key=lambda v: abs(_version_key(v) - target_key))
+        return closest, "CLOSEST"
         
     except (ValueError, IndexError):
         return available_versions[0] if available_versions else None, "LATEST"
 
 
+def _cache_path(api_product: str) -> Path:
+    """Get the cache file path for an API product ID."""
+    safe_name = re.sub(r'[^A-Za-z0-9._-]', '_', api_product)
+    return CACHE_DIR / f"{safe_name}.json"
+
+
+def _read_cache(api_product: str) -> Optional[Dict[str, Any]]:
+    """Return the cached entry for a product, checking memory before disk."""
+    entry = _memory_cache.get(api_product)
+    if entry is not None:
+        return entry
+    
+    try:
+        with open(_cache_path(api_product), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    _memory_cache[api_product] = entry
+    return entry
+
+
+def _write_cache(api_product: str, entry: Dict[str, Any]) -> None:
+    """Store a cache entry in memory and on disk (atomically)."""
+    _memory_cache[api_product] = entry
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(api_product)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write endoflife cache for {api_product}: {e}")
+
+
+def _is_fresh(entry: Dict[str, Any]) -> bool:
+    """Check whether a cache entry is still within its TTL."""
+    ttl = NOT_FOUND_CACHE_TTL if entry.get("not_found") else CACHE_TTL
+    return time.time() - entry.get("ts", 0) < ttl
+
+
+def _not_found_response(api_product: str) -> Dict[str, Any]:
+    """Build the response for a product unknown to endoflife.date."""
+    return {
+        "status": "not_found",
+        "error_type": "PRODUCT_NOT_FOUND",
+        "error_message": f"Product '{api_product}' not found in endoflife.date database"
+    }
+
+
+def _cached_response(api_product: str) -> Optional[Dict[str, Any]]:
+    """Build an API response from a fresh cache entry, if there is one."""
+    entry = _read_cache(api_product)
+    if entry is None or not _is_fresh(entry):
+        return None
+    
+    logger.info(f"Using cached endoflife.date data for: {api_product}")
+    if entry.get("not_found"):
+        return _not_found_response(api_product)
+    return {"status": "success", "data": entry["data"]}
+
+
+class _InflightRequest:
+    """An in-progress API request that concurrent callers can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Dict[str, Any] = {
+            "status": "error",
+            "error_type": "UNEXPECTED_ERROR",
+            "error_message": "Concurrent request for this product failed"
+        }
+
+
+# Single-flight registry: api_product -> request currently being fetched
+_inflight_lock = threading.Lock()
+_inflight: Dict[str, _InflightRequest] = {}
+
+
 def call_endoflife_api(api_product: str, timeout: int = 30, max_retries: int = 3) -> Dict[str, Any]:
-    """Call endoflife.date API to get product version information."""
+    """Call endoflife.date API to get product version information.
+    
+    Responses are cached per product (24h for hits, 1h for unknown products),
+    so repeated lookups within and across runs skip the HTTP round-trip, and
+    expired entries are revalidated with ETag / Last-Modified. Concurrent
+    calls for the same product share a single request.
+    """
+    cached = _cached_response(api_product)
+    if cached is not None:
+        return cached
+    
+    with _inflight_lock:
+        request = _inflight.get(api_product)
+        is_leader = request is None
+        if is_leader:
+            request = _InflightRequest()
+            _inflight[api_product] = request
+    
+    if not is_leader:
+        logger.info(f"Waiting for in-flight endoflife.date request: {api_product}")
+        request.done.wait()
+        return request.result
+    
+    try:
+        # Another caller may have filled the cache between our check and taking the lead
+        request.result = _cached_response(api_product) or _fetch_endoflife_api(api_product, timeout, max_retries)
+    finally:
+        with _inflight_lock:
+            del _inflight[api_product]
+        request.done.set()
+    
+    return request.result
+
+
+def _project_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the cycle fields endoflife_lookup reads (absent keys stay absent)."""
+    return {field: record[field] for field in _RECORD_FIELDS if field in record}
+
+
+def _retry_after_seconds(response, default: float) -> float:
+    """Get the wait time from a Retry-After header, falling back to a default."""
+    retry_after = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(retry_after)) if retry_after else default
+    except ValueError:
+        # HTTP-date form is not worth parsing here
+        return default
+
+
+def _fetch_endoflife_api(api_product: str, timeout: int, max_retries: int) -> Dict[str, Any]:
+    """Fetch product data from endoflife.date with retries, updating the cache."""
+    import requests
+    
+    session = _get_session()
     url = f"https://endoflife.date/api/{api_product}.json"
     
+    # Revalidate an expired entry with a conditional GET so unchanged data costs a 304
+    stale = _read_cache(api_product)
+    headers = {}
+    if stale and "data" in stale:
+        if stale.get("etag"):
+            headers["If-None-Match"] = stale["etag"]
+        if stale.get("last_modified"):
+            headers["If-Modified-Since"] = stale["last_modified"]
+    
     for attempt in range(max_retries):
         try:
-            logger.info(f"Calling endoflife.date API: {url} (attempt {attempt + 1}/{max_retries})")
+            logger.debug(f"Calling endoflife.date API: {url} (attempt {attempt + 1}/{max_retries})")
             
-            response = requests.get(url, timeout=timeout)
+            _BUCKET.acquire()
+            response = session.get(url, headers=headers, timeout=timeout)
             
-            if response.status_code == 200:
-                return {"status": "success", "data": response.json()}
+            if response.status_code == 304 and headers:
+                logger.info(f"endoflife.date data unchanged for: {api_product}")
+                _write_cache(api_product, {**stale, "ts": time.time()})
+                return {"status": "success", "data": stale["data"]}
+            elif response.status_code == 200:
+                # Parse the raw bytes directly; json detects UTF-8 itself, skipping
+                # requests' charset sniffing and the intermediate str decode
+                try:
+                    data = json.loads(response.content)
+                except ValueError as e:
+                    return {
+                        "status": "error",
+                        "error_type": "INVALID_RESPONSE",
+                        "error_message": f"Invalid JSON from endoflife.date: {e}"
+                    }
+                if isinstance(data, list):
+                    data = [_project_record(rec) for rec in data if isinstance(rec, dict)]
+                _write_cache(api_product, {
+                    "ts": time.time(),
+                    "data": data,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                })
+                return {"status": "success", "data": data}
             elif response.status_code == 404:
-                return {
-                    "status": "not_found",
-                    "error_type": "PRODUCT_NOT_FOUND",
-                    "error_message": f"Product '{api_product}' not found in endoflife.date database"
-                }
+                _write_cache(api_product, {"ts": time.time(), "not_found": True})
+                return _not_found_response(api_product)
             elif response.status_code == 429:
-                wait_time = 5 * (attempt + 1)
+                wait_time = _retry_after_seconds(response, default=5 * (attempt + 1))
                 logger.warning(f"Rate limited. Waiting {wait_time}s before retry...")
                 time.sleep(wait_time)
                 continue
@@ -226,7 +509,27 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
                 "error_message": "Version is required"
             }
         
+        # Reject obviously bogus input before it reaches the network and retry loop
         api_product = normalize_product_name(product)
+        if api_product not in _KNOWN_API_PRODUCTS and not _PRODUCT_OK.match(api_product or ""):
+            return {
+                "status": "error",
+                "product": product,
+                "version": version,
+                "error_type": "INVALID_INPUT",
+                "error_message": f"Invalid product name: '{product}'"
+            }
+        
+        normalized_version = normalize_version(version.strip())
+        if not _VERSION_OK.match(normalized_version):
+            return {
+                "status": "error",
+                "product": product,
+                "version": version,
+                "error_type": "INVALID_INPUT",
+                "error_message": f"Invalid version: '{version}'"
+            }
+        
         if not api_product:
             return {
                 "status": "not_found",
@@ -237,8 +540,6 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
                 "available_products": []
             }
         
-        normalized_version = normalize_version(version)
-        
         logger.info(f"Looking up: {product} ({api_product}) version {normalized_version}")
         
         api_response = call_endoflife_api(api_product, timeout, max_retries)
@@ -277,7 +578,13 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
                 "error_message": "No version data available for this product"
             }
         
-        available_versions = [str(v.get("cycle", v.get("version", ""))) for v in versions_data if v.get("cycle")]
+        # Index records by cycle once; the first record for a cycle wins
+        by_cycle: Dict[str, Dict[str, Any]] = {}
+        for v in versions_data:
+            if v.get("cycle"):
+                by_cycle.setdefault(str(v["cycle"]), v)
+        
+        available_versions = list(by_cycle)
         
         if not available_versions:
             return {
@@ -302,7 +609,7 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
                 "available_versions": available_versions
             }
         
-        version_info = next((v for v in versions_data if str(v.get("cycle")) == matched_version), {})
+        version_info = by_cycle.get(matched_version, {})
         
         if not version_info:
             return {
@@ -317,7 +624,7 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
         eol_date = version_info.get("eol", "Unknown")
         support_status = "active" if version_info.get("support", True) else "ended"
         latest_version = available_versions[0] if available_versions else "Unknown"
-        lts_version = next((v.get("cycle") for v in versions_data if v.get("lts")), "N/A")
+        lts_version = next((cycle for cycle, v in by_cycle.items() if v.get("lts")), "N/A")
         release_date = version_info.get("releaseDate", "Unknown")
         
         return {
@@ -343,3 +650,32 @@ def endoflife_lookup(product: str, version: str, timeout: int = 30, max_retries:
             "error_type": "UNEXPECTED_ERROR",
             "error_message": str(e)
         }
+
+
+def endoflife_lookup_many(items: List[Dict[str, str]], timeout: int = 30, max_retries: int = 3,
+                          max_concurrency: int = 8) -> List[Dict[str, Any]]:
+    """Look up several product/version pairs concurrently.
+    
+    Lookups run on a small thread pool sharing the pooled HTTP session, so the
+    batch takes roughly as long as its slowest lookup instead of the sum.
+    Results are returned in the same order as the input items.
+    """
+    if not items:
+        return []
+    
+    def lookup(item: Dict[str, str]) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            return {
+                "status": "error",
+                "error_type": "INVALID_INPUT",
+                "error_message": "Each item must be an object with product and version"
+            }
+        return endoflife_lookup(
+            product=item.get("product", ""),
+            version=item.get("version", ""),
+            timeout=timeout,
+            max_retries=max_retries
+        )
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(items)))) as executor:
+        return list(executor.map(lookup, items))
@@ -1,19 +1,124 @@
 """Tool 1: get_acat_reference - Load ACAT reference datastore names."""
+import hashlib
+import json
 import logging
+import os
+import pickle
 from pathlib import Path
-from typing import Dict, List, Any
-import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Per-user directory for the pickled reference list (survives server restarts)
+CACHE_DIR = Path.home() / ".cache" / "acat-mcp"
+# Bumped when the way the list is read changes, so older pickles are rebuilt
+CACHE_VERSION = 2
+
+
+def _select_column(header: List[Any]) -> int:
+    """Pick the datastore column: "Datastore"/"datastore" if present, else the first."""
+    for name in ("Datastore", "datastore"):
+        if name in header:
+            return header.index(name)
+    return 0
+
 
 class ACATReferenceCache:
     """Cache for ACAT reference data to avoid reloading on every call."""
     
     def __init__(self):
         self._reference_list: List[str] = []
+        self._source: Optional[Tuple[str, float, int]] = None
+        self._serialized: Optional[str] = None
         self._loaded = False
     
+    @staticmethod
+    def _read_workbook(filepath: Path) -> List[str]:
+        """Read unique, non-empty datastore names from the Excel file.
+        
+        Streams the sheet with openpyxl in read-only mode and collects only the
+        datastore column; falls back to pandas if openpyxl is not available.
+        """
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            return ACATReferenceCache._read_workbook_pandas(filepath)
+        
+        datastores = set()
+        wb = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            # First sheet, as pd.read_excel reads: wb.active is whichever tab was
+            # selected when the workbook was saved
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return []
+            
+            col = _select_column(list(header))
+            for row in rows:
+                if len(row) <= col or row[col] is None:
+                    continue
+                name = str(row[col]).strip()
+                if name:
+                    datastores.add(name)
+        finally:
+            wb.close()
+        
+        return sorted(datastores)
+    
+    @staticmethod
+    def _read_workbook_pandas(filepath: Path) -> List[str]:
+        """Read unique, non-empty datastore names from the Excel file with pandas."""
+        import pandas as pd
+        
+        df = pd.read_excel(filepath)
+        column_name = df.columns[_select_column(list(df.columns))]
+        
+        datastores = set()
+        for ds in df[column_name].dropna().to_numpy():
+            name = str(ds).strip()
+            if name:
+                datastores.add(name)
+        
+        return sorted(datastores)
+    
+    @staticmethod
+    def _cache_path(filepath: Path) -> Path:
+        """Get the pickle cache path for a reference file."""
+        digest = hashlib.sha1(str(filepath.resolve()).encode()).hexdigest()
+        return CACHE_DIR / f"acat_ref_{digest}.pkl"
+    
+    @staticmethod
+    def _read_cache(cache_path: Path, stat: os.stat_result) -> Optional[List[str]]:
+        """Read the pickled reference list if it was built from this exact file version."""
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read ACAT reference cache {cache_path}: {e}")
+            return None
+        
+        if (cached.get("version") != CACHE_VERSION
+                or cached.get("mtime") != stat.st_mtime or cached.get("size") != stat.st_size):
+            return None
+        
+        logger.info(f"Loaded ACAT reference from cache: {cache_path}")
+        return cached["list"]
+    
+    @staticmethod
+    def _write_cache(cache_path: Path, stat: os.stat_result, datastores: List[str]) -> None:
+        """Pickle the reference list, keyed by the source file's mtime and size."""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": CACHE_VERSION, "mtime": stat.st_mtime, "size": stat.st_size, "list": datastores}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write ACAT reference cache {cache_path}: {e}")
+    
     def load(self, filepath: Path) -> Dict[str, Any]:
         """Load ACAT reference data from Excel file.
         
@@ -23,13 +128,6 @@ class ACATReferenceCache:
         Returns:
             Dictionary with reference_list and total_count
         """
-        if self._loaded:
-            logger.info("Returning cached ACAT reference data")
-            return {
-                "reference_list": self._reference_list,
-                "total_count": len(self._reference_list)
-            }
-        
         try:
             if not filepath.exists():
                 return {
@@ -40,26 +138,28 @@ class ACATReferenceCache:
                     "total_count": 0
                 }
             
-            logger.info(f"Loading ACAT reference from: {filepath}")
-            
-            # Load Excel file
-            df = pd.read_excel(filepath)
+            # A single stat() tells us whether the in-memory copy is still current
+            stat = filepath.stat()
+            source = (str(filepath), stat.st_mtime, stat.st_size)
+            if self._loaded and self._source == source:
+                logger.info("Returning cached ACAT reference data")
+                return {
+                    "reference_list": self._reference_list,
+                    "total_count": len(self._reference_list)
+                }
             
-            # Extract datastore names from appropriate column
-            # Assuming the column is named "Datastore" or first column
-            if "Datastore" in df.columns:
-                column_name = "Datastore"
-            elif "datastore" in df.columns:
-                column_name = "datastore"
-            else:
-                # Use first column
-                column_name = df.columns[0]
+            logger.info(f"Loading ACAT reference from: {filepath}")
             
-            # Extract unique non-null values
-            datastores = df[column_name].dropna().unique().tolist()
+            # Reuse the list pickled by an earlier process if the file is unchanged
+            cache_path = self._cache_path(filepath)
+            reference_list = self._read_cache(cache_path, stat)
+            if reference_list is None:
+                reference_list = self._read_workbook(filepath)
+                self._write_cache(cache_path, stat, reference_list)
             
-            # Convert to strings and sort
-            self._reference_list = sorted([str(ds).strip() for ds in datastores if str(ds).strip()])
+            self._reference_list = reference_list
+            self._source = source
+            self._serialized = None
             self._loaded = True
             
             logger.info(f"Loaded {len(self._reference_list)} ACAT reference datastores")
@@ -79,6 +179,22 @@ class ACATReferenceCache:
                 "total_count": 0
             }
 
+    
+    def serialized(self, filepath: Path) -> str:
+        """Get the load() result as JSON text.
+        
+        The text is built once per loaded file version and reused, so repeated
+        tool calls skip re-serializing the whole reference list.
+        """
+        result = self.load(filepath)
+        if "status" in result:
+            # Error responses are not cached
+            return json.dumps(result)
+        
+        if self._serialized is None:
+            self._serialized = json.dumps(result)
+        return self._serialized
+
 
 # Global cache instance
 _acat_cache = ACATReferenceCache()
@@ -96,3 +212,15 @@ def get_acat_reference(filepath: Path) -> Dict[str, Any]:
         Dictionary with reference_list and total_count
     """
     return _acat_cache.load(filepath)
+
+
+def get_acat_reference_serialized(filepath: Path) -> str:
+    """Get ACAT reference datastore names as JSON text for the MCP response.
+    
+    Args:
+        filepath: Path to ACAT reference Excel file
+        
+    Returns:
+        JSON string with reference_list and total_count
+    """
+    return _acat_cache.serialized(filepath)
@@ -1,37 +1,61 @@
 """Main Python Agent for ACAT Datastore Matching - Pattern 2 (Agentic)."""
 import asyncio
+import importlib.util
 import logging
+import logging.handlers
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import (
     CLAUDE_API_KEY, CLAUDE_MODEL, CLAUDE_MAX_TOKENS, CLAUDE_TEMPERATURE,
-    USER_INPUT_FILE, OUTPUT_DIR, RATE_LIMIT_DELAY, LOG_LEVEL
+    USER_INPUT_FILE, OUTPUT_DIR, OUTPUT_FORMAT, MAX_CONCURRENT_REQUESTS, REQUESTS_PER_MINUTE, LOG_LEVEL,
+    MATCH_CACHE_FILE
 )
 from mcp_client_wrapper import MCPClientWrapper
 from agentic_orchestrator import AgenticOrchestrator
 from excel_writer import ExcelWriter
+from match_cache import MatchCache
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Buffer file writes; the buffer is flushed when full, on errors and at exit
+_log_file = logging.FileHandler('agent.log')
+_log_file.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('agent.log'), logging.StreamHandler(sys.stdout)]
+    format=LOG_FORMAT,
+    handlers=[
+        logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=_log_file),
+        logging.StreamHandler(sys.stdout)
+    ]
 )
 logger = logging.getLogger(__name__)
 
 
+def _excel_engine() -> str:
+    """Use the faster calamine reader when python-calamine is installed.
+    
+    pandas supports the calamine engine from 2.2 on; older versions use openpyxl.
+    """
+    pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+    if pandas_version >= (2, 2) and importlib.util.find_spec("python_calamine"):
+        return "calamine"
+    return "openpyxl"
+
+
 def load_user_input(filepath: Path) -> List[str]:
     """Load user datastores from Excel file."""
     try:
         logger.info(f"Loading user input from: {filepath}")
-        df = pd.read_excel(filepath)
-        column_name = df.columns[0]
-        datastores = df[column_name].dropna().tolist()
-        datastores = [str(ds).strip() for ds in datastores if str(ds).strip()]
+        # Only the first column is needed; read it as text and clean it vectorized
+        df = pd.read_excel(filepath, engine=_excel_engine(), usecols=[0], dtype=str)
+        names = df.iloc[:, 0].dropna().str.strip()
+        datastores = names[names != ""].tolist()
         logger.info(f"Loaded {len(datastores)} user datastores")
         return datastores
     except Exception as e:
@@ -39,26 +63,65 @@ def load_user_input(filepath: Path) -> List[str]:
         raise
 
 
-def print_summary(results: List[Dict[str, Any]]):
+def build_reference_index(reference_list: List[str]) -> Dict[str, str]:
+    """Map normalized ACAT reference names to their canonical spelling."""
+    return {MatchCache.normalize(name): name for name in reference_list}
+
+
+def merge_results(
+    user_datastores: List[str],
+    known_results: Dict[str, Dict[str, Any]],
+    new_results: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Combine already-known and freshly matched results in input order."""
+    new_by_key = {}
+    for item in new_results:
+        new_by_key.setdefault(MatchCache.normalize(str(item.get("input_datastore", ""))), item)
+    
+    merged = []
+    used = set()
+    for datastore in user_datastores:
+        key = MatchCache.normalize(datastore)
+        item = known_results.get(key) or new_by_key.get(key)
+        if item is not None:
+            merged.append({**item, "input_datastore": datastore})
+            used.add(key)
+    
+    # Keep results Claude returned under a name we could not map back to an input
+    merged.extend(item for key, item in new_by_key.items() if key not in used)
+    return merged
+
+
+def print_summary(results: List[Dict[str, Any]], match_cache: Optional[MatchCache] = None):
     """Print summary statistics."""
     print("\n" + "="*60)
     print("PROCESSING SUMMARY")
     print("="*60)
     
-    total_matches = len(results)
-    high_confidence = len([r for r in results if r.get("confidence", 0) >= 0.8])
-    medium_confidence = len([r for r in results if 0.6 <= r.get("confidence", 0) < 0.8])
-    low_confidence = len([r for r in results if r.get("confidence", 0) < 0.6])
-    
-    with_eol = len([r for r in results if r.get("eol_data") is not None])
+    # Tally confidence buckets and EOL statuses in a single pass
+    confidence_buckets = Counter()
+    eol_statuses = Counter()
+    for r in results:
+        confidence = r.get("confidence", 0)
+        confidence_buckets["high" if confidence >= 0.8 else "medium" if confidence >= 0.6 else "low"] += 1
+        eol_data = r.get("eol_data")
+        if eol_data is not None:
+            eol_statuses[eol_data.get("status", "unknown") if isinstance(eol_data, dict) else "unknown"] += 1
     
     print(f"\nMATCHING RESULTS:")
-    print(f"  Total datastores processed: {total_matches}")
-    print(f"  High confidence (>=0.8): {high_confidence}")
-    print(f"  Medium confidence (0.6-0.8): {medium_confidence}")
-    print(f"  Low confidence (<0.6): {low_confidence}")
+    print(f"  Total datastores processed: {len(results)}")
+    print(f"  High confidence (>=0.8): {confidence_buckets['high']}")
+    print(f"  Medium confidence (0.6-0.8): {confidence_buckets['medium']}")
+    print(f"  Low confidence (<0.6): {confidence_buckets['low']}")
     print(f"\nEOL ENRICHMENT:")
-    print(f"  Datastores with EOL data: {with_eol}")
+    print(f"  Datastores with EOL data: {sum(eol_statuses.values())}")
+    for status, count in sorted(eol_statuses.items()):
+        print(f"    {status}: {count}")
+    
+    if match_cache is not None:
+        print(f"\nMATCH CACHE:")
+        print(f"  Cache hits: {match_cache.hits}")
+        print(f"  Cache misses: {match_cache.misses}")
     
     print("\n" + "="*60)
 
@@ -81,110 +144,155 @@ async def main():
             api_key=CLAUDE_API_KEY,
             model=CLAUDE_MODEL,
             max_tokens=CLAUDE_MAX_TOKENS,
-            temperature=CLAUDE_TEMPERATURE
+            temperature=CLAUDE_TEMPERATURE,
+            max_concurrent=MAX_CONCURRENT_REQUESTS,
+            requests_per_minute=REQUESTS_PER_MINUTE
         )
         
         # Initialize Excel writer
-        excel_writer = ExcelWriter(OUTPUT_DIR)
+        excel_writer = ExcelWriter(OUTPUT_DIR, OUTPUT_FORMAT)
         
         logger.info("Connecting to MCP server...")
-        await mcp_client.connect()
-        
-        # Load user input
-        user_datastores = load_user_input(USER_INPUT_FILE)
-        print(f"Loaded {len(user_datastores)} user datastores\n")
-        
-        # Fetch MCP tool schemas
-        logger.info("Fetching MCP tool schemas...")
-        mcp_tools = await mcp_client.list_tools()
-        print(f"Available MCP tools: {[t['name'] for t in mcp_tools]}\n")
-        
-        print("="*60)
-        print("AGENTIC PROCESSING - Claude Controls Workflow")
-        print("="*60 + "\n")
-        
-        print("Starting agentic loop...")
-        print("Claude will:")
-        print("  1. Fetch ACAT reference data (via MCP tool)")
-        print("  2. Match each datastore against reference")
-        print("  3. Look up EOL data for low-confidence matches")
-        print("  4. Return structured results\n")
-        
-        # Run agentic loop - Claude decides which tools to call!
-        result = await orchestrator.run_agentic_loop(
-            user_datastores=user_datastores,
-            mcp_tools=mcp_tools,
-            mcp_client=mcp_client,
-            max_iterations=20
-        )
-        
-        logger.info(f"Agentic loop completed with status: {result.get('status')}")
-        
-        if result["status"] == "success":
-            results = result["results"]
-            print(f"\n[OK] Agentic processing complete! Processed {len(results)} datastores\n")
+        async with mcp_client:
+            # Load user input
+            user_datastores = load_user_input(USER_INPUT_FILE)
+            print(f"Loaded {len(user_datastores)} user datastores\n")
             
-            # Convert to expected format for Excel writer
-            match_results = []
-            eol_success = []
-            eol_not_found = []
-            eol_errors = []
+            # Fetch MCP tool schemas and the ACAT reference concurrently;
+            # exact matches after normalization need no LLM call
+            logger.info("Fetching MCP tool schemas...")
+            mcp_tools, reference = await asyncio.gather(
+                mcp_client.list_tools(),
+                mcp_client.call_tool("get_acat_reference", {})
+            )
+            print(f"Available MCP tools: {[t['name'] for t in mcp_tools]}\n")
+            reference_index = build_reference_index(reference.get("reference_list", []))
+            if not reference_index:
+                logger.warning(f"ACAT reference unavailable for exact matching: {reference.get('error_message', reference)}")
             
-            for item in results:
-                # Match result
-                match_results.append({
-                    "input_datastore": item.get("input_datastore", ""),
-                    "matched_datastore": item.get("matched_datastore", ""),
-                    "confidence": item.get("confidence", 0.0),
-                    "reasoning": item.get("reasoning", "")
-                })
-                
-                # EOL data categorization
-                eol_data = item.get("eol_data")
-                if eol_data:
-                    if eol_data.get("status") == "success":
-                        eol_success.append({
-                            "input_datastore": item.get("input_datastore"),
-                            **eol_data
-                        })
-                    elif eol_data.get("status") == "not_found":
-                        eol_not_found.append({
-                            "input_datastore": item.get("input_datastore"),
-                            **eol_data
-                        })
-                    elif eol_data.get("status") == "error":
-                        eol_errors.append({
-                            "input_datastore": item.get("input_datastore"),
-                            **eol_data
-                        })
+            # Serve exact and previously matched datastores directly; only the rest go to Claude.
+            # Cached results are only valid for the model and reference list that produced them
+            match_cache = MatchCache(MATCH_CACHE_FILE)
+            cache_scope = f"{CLAUDE_MODEL}|{MatchCache.reference_hash(reference.get('reference_list', []))}"
+            known_results = {}
+            pending_datastores = []
+            exact_matches = 0
+            seen = set()
+            for datastore in user_datastores:
+                key = MatchCache.normalize(datastore)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if key in reference_index:
+                    known_results[key] = {
+                        "input_datastore": datastore,
+                        "matched_datastore": reference_index[key],
+                        "confidence": 1.0,
+                        "reasoning": "Exact match",
+                        "eol_data": None
+                    }
+                    exact_matches += 1
+                    continue
+                cached = match_cache.get(datastore, cache_scope)
+                if cached is not None:
+                    known_results[key] = cached
+                else:
+                    pending_datastores.append(datastore)
+            print(
+                f"Exact matches: {exact_matches}, cached: {len(known_results) - exact_matches}, "
+                f"to process: {len(pending_datastores)}\n"
+            )
             
-            # Write output files
-            print("Writing results to Excel...")
-            match_file = excel_writer.write_match_results(match_results)
-            print(f"[OK] Match results: {match_file}")
+            print("="*60)
+            print("AGENTIC PROCESSING - Claude Controls Workflow")
+            print("="*60 + "\n")
             
-            if eol_success:
-                success_file = excel_writer.write_eol_success(eol_success)
-                print(f"[OK] EOL success: {success_file}")
+            print("Starting agentic loop...")
+            print("Claude will:")
+            print("  1. Fetch ACAT reference data (via MCP tool)")
+            print("  2. Match each datastore against reference")
+            print("  3. Look up EOL data for low-confidence matches")
+            print("  4. Return structured results\n")
             
-            if eol_not_found:
-                not_found_file = excel_writer.write_eol_not_found(eol_not_found)
-                print(f"[OK] EOL not found: {not_found_file}")
+            # Run agentic loop - Claude decides which tools to call!
+            if pending_datastores:
+                result = await orchestrator.run_agentic_loop(
+                    user_datastores=pending_datastores,
+                    mcp_tools=mcp_tools,
+                    mcp_client=mcp_client,
+                    max_iterations=20
+                )
+            else:
+                result = {"status": "success", "results": []}
             
-            if eol_errors:
-                error_file = excel_writer.write_eol_errors(eol_errors)
-                print(f"[OK] EOL errors: {error_file}")
+            logger.info(f"Agentic loop completed with status: {result.get('status')}")
             
-            # Print summary
-            print_summary(results)
-            
-        else:
-            print(f"\n[X] Agentic processing failed: {result.get('error')}")
-            if "raw_response" in result:
-                print(f"Raw response: {result['raw_response'][:500]}...")
-        
-        logger.info("Cleaning up...")
-        await mcp_client.close()
+            if result["status"] == "success":
+                for item in result["results"]:
+                    match_cache.put(str(item.get("input_datastore", "")), item, cache_scope)
+                match_cache.save()
+                
+                results = merge_results(user_datastores, known_results, result["results"])
+                print(f"\n[OK] Agentic processing complete! Processed {len(results)} datastores\n")
+                
+                # Convert to expected format for Excel writer
+                match_results = []
+                eol_success = []
+                eol_not_found = []
+                eol_errors = []
+                
+                for item in results:
+                    # Match result
+                    match_results.append({
+                        "input_datastore": item.get("input_datastore", ""),
+                        "matched_datastore": item.get("matched_datastore", ""),
+                        "confidence": item.get("confidence", 0.0),
+                        "reasoning": item.get("reasoning", "")
+                    })
+                    
+                    # EOL data categorization
+                    eol_data = item.get("eol_data")
+                    if eol_data:
+                        if eol_data.get("status") == "success":
+                            eol_success.append({
+                                "input_datastore": item.get("input_datastore"),
+                                **eol_data
+                            })
+                        elif eol_data.get("status") == "not_found":
+                            eol_not_found.append({
+                                "input_datastore": item.get("input_datastore"),
+                                **eol_data
+                            })
+                        elif eol_data.get("status") == "error":
+                            eol_errors.append({
+                                "input_datastore": item.get("input_datastore"),
+                                **eol_data
+                            })
+                
+                # Write output files
+                print(f"Writing results ({OUTPUT_FORMAT})...")
+                match_file = excel_writer.write_match_results(match_results)
+                print(f"[OK] Match results: {match_file}")
+                
+                if eol_success:
+                    success_file = excel_writer.write_eol_success(eol_success)
+                    print(f"[OK] EOL success: {success_file}")
+                
+                if eol_not_found:
+                    not_found_file = excel_writer.write_eol_not_found(eol_not_found)
+                    print(f"[OK] EOL not found: {not_found_file}")
+                
+                if eol_errors:
+                    error_file = excel_writer.write_eol_errors(eol_errors)
+                    print(f"[OK] EOL errors: {error_file}")
+                
+                # Print summary
+                print_summary(results, match_cache)
+                
+            else:
+                print(f"\n[X] Agentic processing failed: {result.get('error')}")
+                if "raw_response" in result:
+                    print(f"Raw response: {result['raw_response'][:500]}...")
         
         print("\n[OK] Processing complete!\n")
         
@@ -199,4 +307,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        # Faster libuv-based event loop when installed (not available on Windows)
+        uvloop.run(main())
@@ -1,11 +1,19 @@
 """Agentic Orchestrator - LLM-driven tool selection (Pattern 2)."""
 import logging
 import json
+import re
 from typing import List, Dict, Any, Optional
 from anthropic import Anthropic
 
+from rate_limiter import AsyncRateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Body of a ```json fence, else of the first bare ``` fence; an unterminated
+# fence runs to the end
+_JSON_FENCE = re.compile(r"```json\s*(.*?)\s*(?:```|\Z)", re.DOTALL)
+_BARE_FENCE = re.compile(r"```\s*(.*?)\s*(?:```|\Z)", re.DOTALL)
+
 
 class AgenticOrchestrator:
     """
@@ -14,11 +22,23 @@ class AgenticOrchestrator:
     """
     
     def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", 
-                 max_tokens: int = 4000, temperature: float = 0.1):
+                 max_tokens: int = 4000, temperature: float = 0.1, max_concurrent: int = 8,
+                 requests_per_minute: int = 50):
         self.client = Anthropic(api_key=api_key)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        # Bounds how many tool calls from a single turn run at once
+        self.max_concurrent = max_concurrent
+        # Paces Claude requests to the account's RPM limit
+        self._rate_limiter = AsyncRateLimiter(requests_per_minute, 60)
+        # The system prompt is static: build it once and mark it as a prompt-cache
+        # breakpoint so every loop iteration reuses the cached tools + system prefix
+        self._system = [{
+            "type": "text",
+            "text": self.build_system_prompt(),
+            "cache_control": {"type": "ephemeral"}
+        }]
         
     def convert_mcp_tools_to_claude(self, mcp_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -50,6 +70,7 @@ WORKFLOW STRATEGY:
 2. For each user datastore, compare it against the ACAT reference list
 3. Return a match with confidence score (0.0-1.0) and reasoning
 4. For matches with confidence < 0.7, call end_of_life_lookup to get version/EOL data
+   (use end_of_life_lookup_batch to look up several datastores in one call)
 
 MATCHING RULES:
 - Handle typos: "PostGres" → "PostgreSQL"
@@ -113,23 +134,30 @@ Provide structured results for all datastores when complete."""
 
         # Initialize conversation
         messages = [{"role": "user", "content": user_prompt}]
+        reference_cached = False
         
         # Agentic loop
         for iteration in range(max_iterations):
-            logger.info(f"Iteration {iteration + 1}/{max_iterations}")
+            logger.info("Iteration %d/%d", iteration + 1, max_iterations)
             
             try:
                 # Call Claude with tools
+                await self._rate_limiter.acquire()
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=self.max_tokens,
                     temperature=self.temperature,
-                    system=self.build_system_prompt(),
+                    system=self._system,
                     messages=messages,
                     tools=claude_tools
                 )
                 
-                logger.debug(f"Claude response stop_reason: {response.stop_reason}")
+                logger.debug("Claude response stop_reason: %s", response.stop_reason)
+                logger.debug(
+                    "Prompt cache: %s tokens read, %s tokens written",
+                    getattr(response.usage, "cache_read_input_tokens", 0),
+                    getattr(response.usage, "cache_creation_input_tokens", 0)
+                )
                 
                 # Add assistant response to conversation
                 assistant_message = {"role": "assistant", "content": response.content}
@@ -142,28 +170,30 @@ Provide structured results for all datastores when complete."""
                     return self._extract_final_answer(response.content)
                 
                 elif response.stop_reason == "tool_use":
-                    # Claude wants to use tools
-                    tool_results = []
+                    # Claude wants to use tools - calls within one turn are independent,
+                    # so execute them concurrently via the MCP client
+                    tool_uses = [block for block in response.content if block.type == "tool_use"]
+                    for tool_use in tool_uses:
+                        logger.debug("Claude requested tool: %s with input: %s", tool_use.name, tool_use.input)
+                    tool_outputs = await mcp_client.call_tools(
+                        [(tool_use.name, tool_use.input) for tool_use in tool_uses],
+                        max_concurrent=self.max_concurrent
+                    )
                     
-                    for content_block in response.content:
-                        if content_block.type == "tool_use":
-                            tool_name = content_block.name
-                            tool_input = content_block.input
-                            tool_use_id = content_block.id
-                            
-                            logger.info(f"Claude requested tool: {tool_name} with input: {tool_input}")
-                            
-                            # Execute tool via MCP client
-                            tool_result = await mcp_client.call_tool(tool_name, tool_input)
-                            
-                            logger.info(f"Tool {tool_name} returned: {type(tool_result)}")
-                            
-                            # Format tool result for Claude
-                            tool_results.append({
-                                "type": "tool_result",
-                                "tool_use_id": tool_use_id,
-                                "content": json.dumps(tool_result)
-                            })
+                    # Format tool results for Claude (order matches the requests)
+                    tool_results = []
+                    for tool_use, tool_output in zip(tool_uses, tool_outputs):
+                        tool_result = {
+                            "type": "tool_result",
+                            "tool_use_id": tool_use.id,
+                            "content": json.dumps(tool_output)
+                        }
+                        # The ACAT reference list is the bulk of the conversation;
+                        # cache the prefix up to it once (breakpoints are limited)
+                        if tool_use.name == "get_acat_reference" and not reference_cached:
+                            tool_result["cache_control"] = {"type": "ephemeral"}
+                            reference_cached = True
+                        tool_results.append(tool_result)
                     
                     # Add tool results to conversation
                     messages.append({"role": "user", "content": tool_results})
@@ -201,17 +231,8 @@ Provide structured results for all datastores when complete."""
                 # Try to extract JSON from response
                 try:
                     # Look for JSON array in markdown code blocks or plain text
-                    if "```json" in text:
-                        json_start = text.find("```json") + 7
-                        json_end = text.find("```", json_start)
-                        json_text = text[json_start:json_end].strip()
-                    elif "```" in text:
-                        json_start = text.find("```") + 3
-                        json_end = text.find("```", json_start)
-                        json_text = text[json_start:json_end].strip()
-                    else:
-                        # Try to find JSON array directly
-                        json_text = text.strip()
+                    match = _JSON_FENCE.search(text) or _BARE_FENCE.search(text)
+                    json_text = match.group(1) if match else text.strip()
                     
                     results = json.loads(json_text)
                     
@@ -22,12 +22,18 @@ else:
     # Use env var if absolute, otherwise use default
     USER_INPUT_FILE = user_input_env if user_input_env else str(BASE_DIR / "input" / "user_input.xlsx")
 OUTPUT_DIR = BASE_DIR / "output"
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "xlsx").lower()  # xlsx, csv or parquet
 
 # Matching Configuration
 CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.7"))
 
+# Match cache (set MATCH_CACHE_FILE to an empty string to disable persistence)
+match_cache_env = os.getenv("MATCH_CACHE_FILE", str(Path.home() / ".cache" / "acat-matcher" / "match_cache.json"))
+MATCH_CACHE_FILE = Path(match_cache_env).expanduser() if match_cache_env else None
+
 # Rate Limiting
-RATE_LIMIT_DELAY = float(os.getenv("RATE_LIMIT_DELAY", "0.5"))
+REQUESTS_PER_MINUTE = int(os.getenv("REQUESTS_PER_MINUTE", "50"))  # Claude API requests
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,80 +1,237 @@
 """Excel Writer for generating output files."""
 import logging
+import math
+import re
+import zipfile
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
+# Column widths are sized from the header and the first rows only
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+# Header styles are shared by every sheet so openpyxl registers them once
+_HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+OUTPUT_FORMATS = ("xlsx", "csv", "parquet")
+
+# Sheets with at least this many rows are written as raw XML instead of via openpyxl
+RAW_XLSX_MIN_ROWS = 50000
+
+# Fixed column layouts; rows are written as tuples in this order
+MATCH_RESULT_HEADERS = [
+    "Input Datastore", "Matched Datastore", "Confidence Score", "Reasoning",
+    "Requires EOL Lookup", "Processing Status", "Timestamp"
+]
+EOL_SUCCESS_HEADERS = [
+    "Input Datastore", "Product", "Version", "API Product Name", "API Matched Version",
+    "Match Type", "EOL Date", "Support Status", "Latest Version", "LTS Version", "Release Date"
+]
+EOL_NOT_FOUND_HEADERS = [
+    "Input Datastore", "Product", "Version", "API Product Name", "Not Found Type",
+    "Available Versions", "Error Message"
+]
+EOL_ERROR_HEADERS = [
+    "Input Datastore", "Product", "Version", "API Product Name", "Error Type",
+    "Error Details", "Retry Count", "Timestamp"
+]
+
+
+def _column_widths(headers: List[str], rows: List[Tuple]) -> List[int]:
+    """Size each column from its header and the first WIDTH_SAMPLE_ROWS rows."""
+    sample = rows[:WIDTH_SAMPLE_ROWS]
+    widths = []
+    for idx, header in enumerate(headers):
+        max_length = max([len(header)] + [len(str(row[idx])) for row in sample if row[idx]])
+        widths.append(min(max_length + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_CONTENT_TYPES_XML = (
+    _XML_DECL
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS_XML = (
+    _XML_DECL
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS_XML = (
+    _XML_DECL
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Style 0 is the default, style 1 the bold white-on-blue header
+_STYLES_XML = (
+    _XML_DECL
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF4472C4"/><bgColor rgb="FF4472C4"/></patternFill></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+# Control characters that are not allowed in XML 1.0
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _raw_cell(value: Any, style: str = "") -> str:
+    """Render one <c> element; strings are written inline (no shared strings table)."""
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"{style}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f"<c{style}><v>{value!r}</v></c>"
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _write_xlsx_raw(rows: List[Tuple], headers: List[str], path: Path, sheet_name: str = "Sheet1"):
+    """Write an xlsx package by emitting the sheet XML directly.
+    
+    Skips openpyxl's per-cell object graph, which dominates for very large
+    sheets. The header keeps the usual styling and columns are sized as in
+    the openpyxl path.
+    """
+    workbook_xml = (
+        _XML_DECL
+        + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+        f'<sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/>'
+        '</sheets></workbook>'
+    )
+    cols = "".join(
+        f'<col min="{idx}" max="{idx}" width="{width}" customWidth="1"/>'
+        for idx, width in enumerate(_column_widths(headers, rows), start=1)
+    )
+    
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+        zf.writestr("xl/workbook.xml", workbook_xml)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+        zf.writestr("xl/styles.xml", _STYLES_XML)
+        
+        with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write((_XML_DECL + f'<worksheet xmlns="{_MAIN_NS}">').encode())
+            if headers:
+                last_cell = f"{get_column_letter(len(headers))}{len(rows) + 1}"
+                sheet.write(f'<dimension ref="A1:{last_cell}"/>'.encode())
+            if cols:
+                sheet.write(f"<cols>{cols}</cols>".encode())
+            sheet.write(b"<sheetData>")
+            header_cells = "".join(_raw_cell(header, ' s="1"') for header in headers)
+            sheet.write(f"<row>{header_cells}</row>".encode())
+            for row in rows:
+                sheet.write(("<row>" + "".join(map(_raw_cell, row)) + "</row>").encode())
+            sheet.write(b"</sheetData></worksheet>")
+
 
 class ExcelWriter:
-    """Write results to Excel files with formatting."""
+    """Write results to Excel files with formatting (or to CSV/Parquet)."""
     
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, output_format: str = "xlsx"):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format} (expected one of {', '.join(OUTPUT_FORMATS)})")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format
         
-    def _format_worksheet(self, filepath: Path):
-        """Apply formatting to Excel worksheet."""
-        try:
-            wb = load_workbook(filepath)
-            ws = wb.active
-            
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                
-                for cell in column:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            wb.save(filepath)
-            logger.info(f"Formatted Excel file: {filepath}")
-            
-        except Exception as e:
-            logger.error(f"Error formatting Excel file: {e}", exc_info=True)
+    def _write_sheet(self, filepath: Path, sheet_name: str, headers: List[str], rows: List[Tuple]):
+        """Write rows to a formatted worksheet in a single streaming pass."""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_name)
+        
+        # Write-only sheets only accept column widths before the first row
+        for idx, width in enumerate(_column_widths(headers, rows), start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+        
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = _HEADER_FILL
+            cell.font = _HEADER_FONT
+            cell.alignment = _HEADER_ALIGN
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        for row in rows:
+            ws.append(row)
+        
+        wb.save(filepath)
+    
+    def _write_rows(self, filename: str, sheet_name: str, headers: List[str], rows: List[Tuple]) -> Path:
+        """Write rows in the configured output format and return the file path."""
+        filepath = self.output_dir / filename
+        if self.output_format == "xlsx":
+            if len(rows) >= RAW_XLSX_MIN_ROWS:
+                _write_xlsx_raw(rows, headers, filepath, sheet_name)
+            else:
+                self._write_sheet(filepath, sheet_name, headers, rows)
+            return filepath
+        
+        # CSV and Parquet skip Excel formatting entirely
+        df = pd.DataFrame(rows, columns=headers)
+        if self.output_format == "parquet":
+            # Parquet needs one type per column; EOL fields mix dates and booleans
+            for col in df.columns[df.dtypes == object]:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            filepath = filepath.with_suffix(".parquet")
+            df.to_parquet(filepath, index=False)
+        else:
+            filepath = filepath.with_suffix(".csv")
+            df.to_csv(filepath, index=False)
+        return filepath
     
     def write_match_results(self, results: List[Dict[str, Any]], filename: str = "datastore_match_results.xlsx"):
         """Write datastore matching results to Excel."""
         try:
             logger.info(f"Writing {len(results)} match results to {filename}")
             
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             rows = []
             for result in results:
-                row = {
-                    "Input Datastore": result.get("input_datastore", ""),
-                    "Matched Datastore": result.get("matched_datastore", ""),
-                    "Confidence Score": result.get("confidence", 0.0),
-                    "Reasoning": result.get("reasoning", ""),
-                    "Requires EOL Lookup": "Yes" if result.get("confidence", 1.0) < 0.7 else "No",
-                    "Processing Status": "Completed",
-                    "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+                row = (
+                    result.get("input_datastore", ""),
+                    result.get("matched_datastore", ""),
+                    result.get("confidence", 0.0),
+                    result.get("reasoning", ""),
+                    "Yes" if result.get("confidence", 1.0) < 0.7 else "No",
+                    "Completed",
+                    timestamp
+                )
                 rows.append(row)
             
-            df = pd.DataFrame(rows)
-            filepath = self.output_dir / filename
-            df.to_excel(filepath, index=False, sheet_name="Match Results")
-            
-            self._format_worksheet(filepath)
+            filepath = self._write_rows(filename, "Match Results", MATCH_RESULT_HEADERS, rows)
             
             logger.info(f"Successfully wrote match results to {filepath}")
             return filepath
@@ -90,26 +247,22 @@ class ExcelWriter:
             
             rows = []
             for result in results:
-                row = {
-                    "Input Datastore": result.get("input_datastore", ""),
-                    "Product": result.get("product", ""),
-                    "Version": result.get("version", ""),
-                    "API Product Name": result.get("api_product_name", ""),
-                    "API Matched Version": result.get("matched_version", ""),
-                    "Match Type": result.get("match_type", ""),
-                    "EOL Date": result.get("eol_date", ""),
-                    "Support Status": result.get("support_status", ""),
-                    "Latest Version": result.get("latest_version", ""),
-                    "LTS Version": result.get("lts_version", ""),
-                    "Release Date": result.get("release_date", "")
-                }
+                row = (
+                    result.get("input_datastore", ""),
+                    result.get("product", ""),
+                    result.get("version", ""),
+                    result.get("api_product_name", ""),
+                    result.get("matched_version", ""),
+                    result.get("match_type", ""),
+                    result.get("eol_date", ""),
+                    result.get("support_status", ""),
+                    result.get("latest_version", ""),
+                    result.get("lts_version", ""),
+                    result.get("release_date", "")
+                )
                 rows.append(row)
             
-            df = pd.DataFrame(rows)
-            filepath = self.output_dir / filename
-            df.to_excel(filepath, index=False, sheet_name="API Success")
-            
-            self._format_worksheet(filepath)
+            filepath = self._write_rows(filename, "API Success", EOL_SUCCESS_HEADERS, rows)
             
             logger.info(f"Successfully wrote EOL success results to {filepath}")
             return filepath
@@ -129,22 +282,18 @@ class ExcelWriter:
                 if isinstance(available_versions, list):
                     available_versions = ", ".join(available_versions)
                 
-                row = {
-                    "Input Datastore": result.get("input_datastore", ""),
-                    "Product": result.get("product", ""),
-                    "Version": result.get("version", ""),
-                    "API Product Name": result.get("api_product_name", ""),
-                    "Not Found Type": result.get("error_type", ""),
-                    "Available Versions": available_versions,
-                    "Error Message": result.get("error_message", "")
-                }
+                row = (
+                    result.get("input_datastore", ""),
+                    result.get("product", ""),
+                    result.get("version", ""),
+                    result.get("api_product_name", ""),
+                    result.get("error_type", ""),
+                    available_versions,
+                    result.get("error_message", "")
+                )
                 rows.append(row)
             
-            df = pd.DataFrame(rows)
-            filepath = self.output_dir / filename
-            df.to_excel(filepath, index=False, sheet_name="API Not Found")
-            
-            self._format_worksheet(filepath)
+            filepath = self._write_rows(filename, "API Not Found", EOL_NOT_FOUND_HEADERS, rows)
             
             logger.info(f"Successfully wrote EOL not found results to {filepath}")
             return filepath
@@ -158,25 +307,22 @@ class ExcelWriter:
         try:
             logger.info(f"Writing {len(results)} EOL error results to {filename}")
             
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             rows = []
             for result in results:
-                row = {
-                    "Input Datastore": result.get("input_datastore", ""),
-                    "Product": result.get("product", ""),
-                    "Version": result.get("version", ""),
-                    "API Product Name": result.get("api_product_name", ""),
-                    "Error Type": result.get("error_type", ""),
-                    "Error Details": result.get("error_message", ""),
-                    "Retry Count": result.get("retry_count", 0),
-                    "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+                row = (
+                    result.get("input_datastore", ""),
+                    result.get("product", ""),
+                    result.get("version", ""),
+                    result.get("api_product_name", ""),
+                    result.get("error_type", ""),
+                    result.get("error_message", ""),
+                    result.get("retry_count", 0),
+                    timestamp
+                )
                 rows.append(row)
             
-            df = pd.DataFrame(rows)
-            filepath = self.output_dir / filename
-            df.to_excel(filepath, index=False, sheet_name="API Errors")
-            
-            self._format_worksheet(filepath)
+            filepath = self._write_rows(filename, "API Errors", EOL_ERROR_HEADERS, rows)
             
             logger.info(f"Successfully wrote EOL error results to {filepath}")
             return filepath
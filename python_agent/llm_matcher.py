@@ -1,103 +1,352 @@
 """LLM Matcher using Claude API for fuzzy datastore matching."""
+import asyncio
 import logging
-import json
-from typing import Dict, Any, List
-from anthropic import Anthropic
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+from rapidfuzz import fuzz, process, utils
+
+from match_cache import MatchCache
 
 logger = logging.getLogger(__name__)
 
+MATCHING_RULES = """MATCHING RULES:
+1. Handle typos: "PostGres" → "PostgreSQL"
+2. Ignore case: "mysql" = "MySQL"
+3. Ignore special chars: "PostGres: 14.6" = "PostgreSQL 14.6"
+4. Match closest version if exact not found
+5. Product name MUST match (PostgreSQL ≠ MySQL)
+6. NEVER match different products
+7. Strip version suffixes: ".x", "x", "-log"
+8. Ignore qualifiers: "SP2", "R2", "Enterprise" unless in reference
+
+Provide confidence score 0.0-1.0:
+- 1.0 = Exact match
+- 0.8-0.95 = Very confident (minor differences)
+- 0.6-0.75 = Moderate confidence (unclear version)
+- < 0.6 = Low confidence (product unclear or not in list)"""
+
+# Static part of the single-input system prompt
+MATCH_PROMPT_TAIL = f"""{MATCHING_RULES}
+
+Report the result with the emit_match tool."""
+
+_MATCH_PROPERTIES = {
+    "matched_datastore": {
+        "type": "string",
+        "description": "Exact reference name from the list, or 'NOT FOUND'"
+    },
+    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+    "reasoning": {"type": "string", "description": "One short sentence, at most 15 words"}
+}
+
+# Structured output: Claude is forced to call these tools, so the SDK hands back
+# the result as a dict instead of JSON embedded in prose
+EMIT_MATCH_TOOL = {
+    "name": "emit_match",
+    "description": "Report the ACAT reference match for the input datastore.",
+    "input_schema": {
+        "type": "object",
+        "properties": _MATCH_PROPERTIES,
+        "required": ["matched_datastore", "confidence"]
+    }
+}
+EMIT_MATCHES_TOOL = {
+    "name": "emit_matches",
+    "description": "Report the ACAT reference match for every input datastore, in input order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "matches": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "input_datastore": {"type": "string", "description": "Input name exactly as given"},
+                        **_MATCH_PROPERTIES
+                    },
+                    "required": ["input_datastore", "matched_datastore", "confidence"]
+                }
+            }
+        },
+        "required": ["matches"]
+    }
+}
+
+# Results kept in memory per (normalized input, reference list); oldest evicted first
+MATCH_CACHE_SIZE = 4096
+
+# Match results persisted across runs; separate from the agent's match cache
+# file because these results carry no EOL data
+DEFAULT_LLM_CACHE_FILE = Path.home() / ".cache" / "acat-matcher" / "llm_match_cache.json"
+LLM_CACHE_TTL = 30 * 24 * 60 * 60  # seconds a persisted match stays valid
+
 
 class LLMatcher:
-    """Use Claude API for fuzzy datastore name matching."""
+    """Use Claude API for fuzzy datastore name matching.
+    
+    Bind the reference list once with set_reference() and the match methods
+    can then be called with just the inputs; passing reference_list
+    explicitly rebinds it.
+    """
     
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", max_tokens: int = 1000, temperature: float = 0.1):
-        self.client = Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", max_tokens: int = 200, temperature: float = 0.1,
+                 topk: Optional[int] = 20, shortcut_score: float = 100.0, concurrency: int = 8,
+                 cache_file: Optional[Path] = DEFAULT_LLM_CACHE_FILE):
+        # One pooled HTTP/2 connection multiplexes concurrent requests, so parallel
+        # matches don't each pay a TLS handshake; the SDK's client class keeps its
+        # default timeouts and connection limits
+        self.client = AsyncAnthropic(api_key=api_key, http_client=DefaultAsyncHttpxClient(http2=True))
         self.model = model
+        # A forced emit_match call needs well under 200 output tokens
         self.max_tokens = max_tokens
         self.temperature = temperature
+        # Only the topk closest reference names are sent to Claude (None sends all);
+        # a sole best candidate scoring at least shortcut_score is accepted without
+        # Claude. WRatio scores token subsets ("PostgreSQL 14" vs "PostgreSQL 14.6")
+        # at 95, so only 100 (equal after case and punctuation folding) is safe
+        self.topk = topk
+        self.shortcut_score = shortcut_score
+        # Bounds in-flight Claude requests (keep within the account's rate limits)
+        self._sem = asyncio.Semaphore(concurrency)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._ref_list: Optional[List[str]] = None
+        self._ref_hash: Optional[str] = None
+        # Normalized reference name -> reference name, for exact matches
+        self._ref_index: Dict[str, str] = {}
+        # Last built system block, reused while the reference list is unchanged
+        self._preamble_key: Optional[Tuple[str, ...]] = None
+        self._preamble: List[Dict[str, Any]] = []
+        # Results persisted across runs (cache_file=None disables); new entries are
+        # written out after each match()/match_all() call that added any
+        self._disk_cache = MatchCache(cache_file, ttl=LLM_CACHE_TTL) if cache_file is not None else None
+        self._unsaved = 0
         
-    def build_prompt(self, input_datastore: str, reference_list: List[str]) -> str:
-        """Build matching prompt for Claude."""
+    def _bind_reference(self, reference_list: List[str]) -> str:
+        """Return the cache hash of the reference list, recomputing it only when the list changes.
+        
+        The hash is content-based (not Python's per-process hash()) so it is
+        stable across runs for the disk cache.
+        """
+        if reference_list is not self._ref_list:
+            self._ref_list = reference_list
+            self._ref_hash = MatchCache.reference_hash(reference_list)
+            self._ref_index = {}
+            for name in reference_list:
+                self._ref_index.setdefault(MatchCache.normalize(name), name)
+        return self._ref_hash
+    
+    def set_reference(self, reference_list: List[str]) -> None:
+        """Bind the reference list used when a match method is called without one.
+        
+        The list's hash and exact-match index (and, with topk=None, the system
+        prompt) are built here once instead of on the first match.
+        """
+        self._bind_reference(reference_list)
+        if self.topk is None:
+            self._system_blocks(reference_list)
+    
+    def _reference(self, reference_list: Optional[List[str]]) -> List[str]:
+        """Return reference_list, or the list bound by set_reference() when it is None."""
+        if reference_list is not None:
+            return reference_list
+        if self._ref_list is None:
+            raise ValueError("No reference list given. Call set_reference() first.")
+        return self._ref_list
+    
+    def _system_blocks(self, reference_list: List[str]) -> List[Dict[str, Any]]:
+        """Return the system block for reference_list, rebuilding it only when the list changes."""
+        ref_key = tuple(reference_list)
+        if ref_key != self._preamble_key:
+            formatted_ref = "\n".join("- " + ds for ds in reference_list)
+            system_text = f"""TASK: Match the input datastore to the most appropriate ACAT reference value.
+
+ACAT REFERENCE LIST:
+{formatted_ref}
+
+{MATCH_PROMPT_TAIL}"""
+            self._preamble_key = ref_key
+            self._preamble = [{"type": "text", "text": system_text, "cache_control": {"type": "ephemeral"}}]
+        return self._preamble
+    
+    def build_prompt(self, input_datastore: str, reference_list: List[str]) -> Tuple[List[Dict[str, Any]], str]:
+        """Build matching prompt for Claude.
+        
+        Returns (system_blocks, user_text). The system block carries everything
+        that is the same for every input (task, reference list, rules, output
+        format) and is marked for prompt caching; the user text is just the input.
+        """
+        return self._system_blocks(reference_list), f"INPUT DATASTORE: {input_datastore}"
+    
+    def build_batch_prompt(self, input_datastores: List[str], reference_list: List[str]) -> str:
+        """Build a prompt matching several input datastores in one request."""
+        formatted_inputs = "\n".join([f"{i}. {ds}" for i, ds in enumerate(input_datastores, 1)])
         formatted_ref = "\n".join([f"- {ds}" for ds in reference_list])
         
-        prompt = f"""TASK: Match the input datastore to the most appropriate ACAT reference value.
+        prompt = f"""TASK: Match each input datastore to the most appropriate ACAT reference value.
 
-INPUT DATASTORE: {input_datastore}
+INPUT DATASTORES:
+{formatted_inputs}
 
 ACAT REFERENCE LIST:
 {formatted_ref}
 
-MATCHING RULES:
-1. Handle typos: "PostGres" → "PostgreSQL"
-2. Ignore case: "mysql" = "MySQL"
-3. Ignore special chars: "PostGres: 14.6" = "PostgreSQL 14.6"
-4. Match closest version if exact not found
-5. Product name MUST match (PostgreSQL ≠ MySQL)
-6. NEVER match different products
-7. Strip version suffixes: ".x", "x", "-log"
-8. Ignore qualifiers: "SP2", "R2", "Enterprise" unless in reference
+{MATCHING_RULES}
 
-Provide confidence score 0.0-1.0:
-- 1.0 = Exact match
-- 0.8-0.95 = Very confident (minor differences)
-- 0.6-0.75 = Moderate confidence (unclear version)
-- < 0.6 = Low confidence (product unclear or not in list)
-
-OUTPUT FORMAT (JSON only, no other text):
-{{
-  "matched_datastore": "exact reference name from list or 'NOT FOUND'",
-  "confidence": 0.95,
-  "reasoning": "brief explanation of match"
-}}"""
+Report one result per input, in the same order, with the emit_matches tool."""
         
         return prompt
     
-    async def match(self, input_datastore: str, reference_list: List[str]) -> Dict[str, Any]:
-        """Match input datastore to ACAT reference using LLM."""
+    @staticmethod
+    def _tool_input(content_blocks: List, tool_name: str) -> Dict[str, Any]:
+        """Return the input of the named tool_use block in Claude's response."""
+        for block in content_blocks:
+            if block.type == "tool_use" and block.name == tool_name:
+                return dict(block.input)
+        raise ValueError(f"No {tool_name} tool call in response")
+    
+    def _parse_match_response(self, input_datastore: str, content_blocks: List) -> Dict[str, Any]:
+        """Read Claude's emit_match result for a single input datastore."""
         try:
-            logger.info(f"Matching datastore: {input_datastore}")
+            result = self._tool_input(content_blocks, EMIT_MATCH_TOOL["name"])
             
-            prompt = self.build_prompt(input_datastore, reference_list)
+            if "matched_datastore" not in result or "confidence" not in result:
+                raise ValueError("Missing required fields in response")
             
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            result["input_datastore"] = input_datastore
             
-            response_text = response.content[0].text.strip()
-            logger.debug(f"Claude response: {response_text}")
+            logger.info("Match result: %s (confidence: %s)", result["matched_datastore"], result["confidence"])
             
-            try:
-                if "```json" in response_text:
-                    json_start = response_text.find("```json") + 7
-                    json_end = response_text.find("```", json_start)
-                    response_text = response_text[json_start:json_end].strip()
-                elif "```" in response_text:
-                    json_start = response_text.find("```") + 3
-                    json_end = response_text.find("```", json_start)
-                    response_text = response_text[json_start:json_end].strip()
-                
-                result = json.loads(response_text)
-                
-                if "matched_datastore" not in result or "confidence" not in result:
-                    raise ValueError("Missing required fields in response")
-                
-                result["input_datastore"] = input_datastore
-                
-                logger.info(f"Match result: {result['matched_datastore']} (confidence: {result['confidence']})")
-                
+            return result
+            
+        except ValueError as e:
+            logger.error(f"Failed to parse Claude response: {e}")
+            # Reported as ERROR (not NOT FOUND) so one bad reply isn't cached
+            return {
+                "input_datastore": input_datastore,
+                "matched_datastore": "ERROR",
+                "confidence": 0.0,
+                "reasoning": f"Failed to parse LLM response: {str(e)}"
+            }
+    
+    async def match(self, input_datastore: str, reference_list: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Match input datastore to ACAT reference using LLM.
+        
+        Inputs that equal a reference name up to case and whitespace are matched
+        directly. Other results are memoized per normalized input and reference
+        list, in memory and on disk, so repeated datastores (differing only in
+        case or whitespace) cost no API call, within a run or across runs.
+        """
+        result = await self._match_one(input_datastore, self._reference(reference_list))
+        self._save_disk_cache()
+        return result
+    
+    def _save_disk_cache(self):
+        """Write the persistent cache if results were added since the last save."""
+        if self._disk_cache and self._unsaved:
+            self._disk_cache.save()
+            self._unsaved = 0
+    
+    async def _match_one(self, input_datastore: str, reference_list: List[str]) -> Dict[str, Any]:
+        """Match one input through the exact index and caches, calling Claude on a miss."""
+        key = (MatchCache.normalize(input_datastore), self._bind_reference(reference_list))
+        exact = self._ref_index.get(key[0])
+        if exact is not None:
+            logger.debug("Exact match: %s -> %s", input_datastore, exact)
+            return {
+                "input_datastore": input_datastore,
+                "matched_datastore": exact,
+                "confidence": 1.0,
+                "reasoning": "Exact match"
+            }
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug("Match cache hit: %s", input_datastore)
+            return {**cached, "input_datastore": input_datastore}
+        
+        scope = f"{self.model}|{key[1]}"
+        result = self._disk_cache.get(input_datastore, scope) if self._disk_cache else None
+        if result is not None:
+            logger.debug("LLM cache hit: %s", input_datastore)
+        else:
+            result = await self._match_uncached(input_datastore, reference_list)
+            # Errors are not cached so the next call retries
+            if result["matched_datastore"] == "ERROR":
                 return result
-                
-            except (json.JSONDecodeError, ValueError) as e:
-                logger.error(f"Failed to parse Claude response: {e}")
+            if self._disk_cache:
+                self._disk_cache.put(input_datastore, result, scope)
+                self._unsaved += 1
+        
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = dict(result)
+        return result
+    
+    def _candidates(self, input_datastore: str, reference_list: List[str]) -> List[Tuple[str, float]]:
+        """Rank reference names by fuzzy similarity to the input, best first."""
+        return [
+            (name, score)
+            for name, score, _ in process.extract(
+                input_datastore, reference_list,
+                scorer=fuzz.WRatio, processor=utils.default_process, limit=self.topk
+            )
+        ]
+    
+    async def match_all(self, inputs: List[str], reference_list: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Match several datastores concurrently, one match() per input.
+        
+        Requests overlap up to the concurrency limit; results are returned in the
+        same order as inputs. Inputs that normalize to the same name are matched
+        once, since concurrent duplicates would all miss the cache together.
+        """
+        reference_list = self._reference(reference_list)
+        unique: Dict[str, str] = {}
+        for input_datastore in inputs:
+            unique.setdefault(MatchCache.normalize(input_datastore), input_datastore)
+        
+        results = await asyncio.gather(*(self._match_one(i, reference_list) for i in unique.values()))
+        self._save_disk_cache()
+        by_key = dict(zip(unique, results))
+        return [{**by_key[MatchCache.normalize(i)], "input_datastore": i} for i in inputs]
+    
+    async def _match_uncached(self, input_datastore: str, reference_list: List[str]) -> Dict[str, Any]:
+        """Match input datastore to ACAT reference with a Claude request."""
+        try:
+            logger.debug("Matching datastore: %s", input_datastore)
+            
+            candidates = self._candidates(input_datastore, reference_list)
+            # A tie (e.g. two versions of the same product) is left to Claude's version rules
+            if (candidates and candidates[0][1] >= self.shortcut_score
+                    and (len(candidates) == 1 or candidates[1][1] < candidates[0][1])):
+                name, score = candidates[0]
+                logger.info("Match result: %s (fuzzy score: %.1f)", name, score)
                 return {
                     "input_datastore": input_datastore,
-                    "matched_datastore": "NOT FOUND",
-                    "confidence": 0.0,
-                    "reasoning": f"Failed to parse LLM response: {str(e)}"
+                    "matched_datastore": name,
+                    "confidence": round(score / 100, 2),
+                    "reasoning": f"Fuzzy match (score {score:.0f}), no LLM call needed"
                 }
+            
+            if self.topk is not None:
+                reference_list = [name for name, _ in candidates]
+            system_blocks, user_text = self.build_prompt(input_datastore, reference_list)
+            
+            async with self._sem:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_blocks,
+                    messages=[{"role": "user", "content": user_text}],
+                    tools=[EMIT_MATCH_TOOL],
+                    tool_choice={"type": "tool", "name": EMIT_MATCH_TOOL["name"]}
+                )
+            
+            logger.debug("Claude response: %s", response.content)
+            logger.debug("Prompt cache read tokens: %s", getattr(response.usage, "cache_read_input_tokens", 0))
+            
+            return self._parse_match_response(input_datastore, response.content)
                 
         except Exception as e:
             logger.error(f"Error in LLM matching: {e}", exc_info=True)
@@ -107,3 +356,180 @@ OUTPUT FORMAT (JSON only, no other text):
                 "confidence": 0.0,
                 "reasoning": f"Error during matching: {str(e)}"
             }
+    
+    async def match_batch(self, input_datastores: List[str],
+                          reference_list: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Match several datastores against ACAT reference with a single Claude request.
+        
+        The reference list is sent once for the whole batch instead of once per
+        input. Results are returned in the same order as input_datastores.
+        """
+        if not input_datastores:
+            return []
+        reference_list = self._reference(reference_list)
+        
+        try:
+            logger.info(f"Matching batch of {len(input_datastores)} datastores")
+            
+            prompt = self.build_batch_prompt(input_datastores, reference_list)
+            
+            async with self._sem:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    # Each result needs its own share of the output budget
+                    max_tokens=max(self.max_tokens, 150 * len(input_datastores)),
+                    temperature=self.temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    tools=[EMIT_MATCHES_TOOL],
+                    tool_choice={"type": "tool", "name": EMIT_MATCHES_TOOL["name"]}
+                )
+            
+            logger.debug("Claude batch response: %s", response.content)
+            
+            try:
+                results = self._tool_input(response.content, EMIT_MATCHES_TOOL["name"]).get("matches")
+                if not isinstance(results, list):
+                    raise ValueError("Expected a list of matches")
+            except ValueError as e:
+                logger.error(f"Failed to parse Claude batch response: {e}")
+                return [
+                    {
+                        "input_datastore": input_datastore,
+                        "matched_datastore": "NOT FOUND",
+                        "confidence": 0.0,
+                        "reasoning": f"Failed to parse LLM response: {str(e)}"
+                    }
+                    for input_datastore in input_datastores
+                ]
+            
+            # Pair results with inputs by the echoed input name, so a dropped or
+            # reordered entry can't shift every later match onto the wrong input.
+            # Position is the fallback for entries whose name matches no input.
+            input_keys = {MatchCache.normalize(ds) for ds in input_datastores}
+            by_name: Dict[str, List[int]] = {}
+            for j, result in enumerate(results):
+                if (isinstance(result, dict) and "matched_datastore" in result and "confidence" in result
+                        and isinstance(result.get("input_datastore"), str)):
+                    by_name.setdefault(MatchCache.normalize(result["input_datastore"]), []).append(j)
+            
+            used = set()
+            matched = []
+            for i, input_datastore in enumerate(input_datastores):
+                j = next((j for j in by_name.get(MatchCache.normalize(input_datastore), []) if j not in used), None)
+                if j is None and i < len(results) and i not in used and isinstance(results[i], dict):
+                    echoed = results[i].get("input_datastore")
+                    if not isinstance(echoed, str) or MatchCache.normalize(echoed) not in input_keys:
+                        j = i
+                result = results[j] if j is not None else {}
+                if "matched_datastore" not in result or "confidence" not in result:
+                    matched.append({
+                        "input_datastore": input_datastore,
+                        "matched_datastore": "NOT FOUND",
+                        "confidence": 0.0,
+                        "reasoning": "No valid result for this input in batch response"
+                    })
+                    continue
+                
+                used.add(j)
+                result["input_datastore"] = input_datastore
+                matched.append(result)
+            
+            logger.info(f"Batch matched {len(matched)} datastores")
+            return matched
+            
+        except Exception as e:
+            logger.error(f"Error in LLM batch matching: {e}", exc_info=True)
+            return [
+                {
+                    "input_datastore": input_datastore,
+                    "matched_datastore": "ERROR",
+                    "confidence": 0.0,
+                    "reasoning": f"Error during matching: {str(e)}"
+                }
+                for input_datastore in input_datastores
+            ]
+    
+    async def match_many(
+        self,
+        inputs: List[str],
+        reference_list: Optional[List[str]] = None,
+        poll_interval: float = 10.0
+    ) -> List[Dict[str, Any]]:
+        """Match many datastores through the Message Batches API.
+        
+        Each input gets its own request (same prompt as match()), but all of them
+        are submitted as one batch job at half the per-token price. Batches are
+        asynchronous on Anthropic's side, so this polls until the job has ended;
+        use it for bulk runs rather than interactive ones. Results are returned
+        in the same order as inputs.
+        """
+        if not inputs:
+            return []
+        reference_list = self._reference(reference_list)
+        
+        try:
+            logger.info(f"Submitting batch of {len(inputs)} datastores")
+            
+            requests = []
+            for i, input_datastore in enumerate(inputs):
+                system_blocks, user_text = self.build_prompt(input_datastore, reference_list)
+                requests.append({
+                    "custom_id": f"in-{i}",
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": self.max_tokens,
+                        "temperature": self.temperature,
+                        "system": system_blocks,
+                        "messages": [{"role": "user", "content": user_text}],
+                        "tools": [EMIT_MATCH_TOOL],
+                        "tool_choice": {"type": "tool", "name": EMIT_MATCH_TOOL["name"]}
+                    }
+                })
+            batch = await self.client.messages.batches.create(requests=requests)
+            
+            while batch.processing_status != "ended":
+                await asyncio.sleep(poll_interval)
+                batch = await self.client.messages.batches.retrieve(batch.id)
+                logger.debug("Batch %s status: %s", batch.id, batch.processing_status)
+            
+            # Batch results come back in arbitrary order; map them by custom_id
+            results: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+            async for entry in await self.client.messages.batches.results(batch.id):
+                i = int(entry.custom_id.split("-", 1)[1])
+                if entry.result.type == "succeeded":
+                    results[i] = self._parse_match_response(inputs[i], entry.result.message.content)
+                else:
+                    results[i] = {
+                        "input_datastore": inputs[i],
+                        "matched_datastore": "ERROR",
+                        "confidence": 0.0,
+                        "reasoning": f"Batch request {entry.result.type}"
+                    }
+            
+            logger.info(f"Batch {batch.id} matched {len(inputs)} datastores")
+            return [
+                result if result is not None else {
+                    "input_datastore": input_datastore,
+                    "matched_datastore": "ERROR",
+                    "confidence": 0.0,
+                    "reasoning": "No result returned for this input"
+                }
+                for input_datastore, result in zip(inputs, results)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error in LLM batch job: {e}", exc_info=True)
+            return [
+                {
+                    "input_datastore": input_datastore,
+                    "matched_datastore": "ERROR",
+                    "confidence": 0.0,
+                    "reasoning": f"Error during matching: {str(e)}"
+                }
+                for input_datastore in inputs
+            ]
+    
+    async def aclose(self):
+        """Close the HTTP connection pool and save the result cache."""
+        await self.client.close()
+        self._save_disk_cache()
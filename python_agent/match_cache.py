@@ -0,0 +1,106 @@
+"""Persistent cache of datastore match results."""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCache:
+    """Cache match results keyed by scope and normalized datastore name.
+    
+    Inputs that differ only in case or whitespace ("PostgreSQL 14" vs
+    "postgresql 14 ") share an entry, so repeated datastores - within a run
+    and across runs - skip the LLM entirely. The scope names what a result
+    depends on (model and reference list hash); when either changes, old
+    entries stop matching and age out. Entries are persisted as JSON.
+    """
+    
+    def __init__(self, cache_file: Optional[Path], ttl: float = 7 * 24 * 60 * 60):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+    
+    @staticmethod
+    def normalize(datastore: str) -> str:
+        """Normalize a datastore name (case and whitespace) for matching and caching."""
+        return " ".join(datastore.lower().split())
+    
+    @staticmethod
+    def reference_hash(reference_list: List[str]) -> str:
+        """Hash a reference list for use in a scope.
+        
+        Content-based (not Python's per-process hash()) so it is stable across runs.
+        """
+        return hashlib.blake2b("\n".join(reference_list).encode(), digest_size=16).hexdigest()
+    
+    def _key(self, datastore: str, scope: str) -> str:
+        """Build the cache key for a datastore name within a scope."""
+        return f"{scope}|{self.normalize(datastore)}"
+    
+    def _load(self):
+        """Load cache entries from disk, dropping expired ones."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                entries = json.load(f)
+            now = time.time()
+            # Malformed entries are dropped, so they read as misses
+            self._entries = {
+                key: entry for key, entry in entries.items()
+                if isinstance(entry, dict) and isinstance(entry.get("result"), dict)
+                and now - entry.get("ts", 0) < self.ttl
+            }
+            logger.info(f"Loaded {len(self._entries)} cached matches from {self.cache_file}")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read match cache {self.cache_file}: {e}")
+    
+    def get(self, datastore: str, scope: str = "") -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for a datastore, or None."""
+        entry = self._entries.get(self._key(datastore, scope))
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return {**entry["result"], "input_datastore": datastore}
+    
+    def put(self, datastore: str, result: Dict[str, Any], scope: str = ""):
+        """Store a result unless it is an error or incomplete.
+        
+        Results whose EOL lookup failed are skipped too, so a transient
+        endoflife.date error is retried on the next run instead of cached.
+        """
+        if "matched_datastore" not in result or "confidence" not in result:
+            return
+        if result["matched_datastore"] == "ERROR":
+            return
+        eol_data = result.get("eol_data")
+        if isinstance(eol_data, dict) and eol_data.get("status") == "error":
+            return
+        
+        self._entries[self._key(datastore, scope)] = {"ts": time.time(), "result": dict(result)}
+    
+    def save(self):
+        """Write cache entries to disk (atomically)."""
+        if not self.cache_file:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_file)
+            logger.info(f"Saved {len(self._entries)} cached matches to {self.cache_file}")
+        except OSError as e:
+            logger.warning(f"Could not write match cache {self.cache_file}: {e}")
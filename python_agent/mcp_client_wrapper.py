@@ -1,26 +1,45 @@
 """MCP Client Wrapper for easier communication with MCP server."""
+import ast
 import asyncio
 import json
 import logging
 import sys
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+try:
+    # Much faster on the large reference-list payload; raises a json.JSONDecodeError subclass
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Tools whose results do not change during a session; reused instead of re-fetched
+CACHEABLE_TOOLS = frozenset({"get_acat_reference"})
+
 
 class MCPClientWrapper:
-    """Wrapper around MCP Python SDK for easier tool calls."""
+    """Wrapper around MCP Python SDK for easier tool calls.
+    
+    Use as an async context manager so the session and the server subprocess
+    are always cleaned up:
+    
+        async with MCPClientWrapper(path) as mcp_client:
+            await mcp_client.call_tool(...)
+    """
     
     def __init__(self, server_script_path: str):
         self.server_script_path = Path(server_script_path)
         self.session: Optional[ClientSession] = None
         self.read_stream = None
         self.write_stream = None
-        self._context = None
+        self._stack: Optional[AsyncExitStack] = None
+        self._result_cache: Dict[str, Dict[str, Any]] = {}
         
     async def connect(self):
         """Establish connection to MCP server."""
@@ -33,12 +52,13 @@ class MCPClientWrapper:
                 env=None
             )
             
-            self._context = stdio_client(server_params)
-            self.read_stream, self.write_stream = await self._context.__aenter__()
-            
-            self.session = ClientSession(self.read_stream, self.write_stream)
-            await self.session.__aenter__()
-            await self.session.initialize()
+            # The exit stack unwinds the session and stdio pipes in order,
+            # including when connecting fails halfway
+            async with AsyncExitStack() as stack:
+                self.read_stream, self.write_stream = await stack.enter_async_context(stdio_client(server_params))
+                self.session = await stack.enter_async_context(ClientSession(self.read_stream, self.write_stream))
+                await self.session.initialize()
+                self._stack = stack.pop_all()
             
             logger.info("Successfully connected to MCP server")
             
@@ -46,9 +66,17 @@ class MCPClientWrapper:
             logger.info(f"Available tools: {[tool.name for tool in tools_result.tools]}")
             
         except Exception as e:
+            self.session = None
             logger.error(f"Failed to connect to MCP server: {e}", exc_info=True)
             raise
     
+    async def __aenter__(self) -> "MCPClientWrapper":
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
     async def list_tools(self) -> List[Dict[str, Any]]:
         """List available MCP tools with their schemas."""
         if not self.session:
@@ -76,12 +104,51 @@ class MCPClientWrapper:
             return []
     
     async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call an MCP tool, reusing this session's result for cacheable tools."""
+        if tool_name not in CACHEABLE_TOOLS:
+            return await self._call_tool(tool_name, arguments)
+        
+        cache_key = f"{tool_name}:{json.dumps(arguments or {}, sort_keys=True)}"
+        if cache_key in self._result_cache:
+            logger.debug("Returning cached result for tool: %s", tool_name)
+            return self._result_cache[cache_key]
+        
+        result = await self._call_tool(tool_name, arguments)
+        # Errors are not cached so the next call retries
+        if not any(key in result for key in ("status", "error", "raw_response")):
+            self._result_cache[cache_key] = result
+        return result
+    
+    async def call_tools(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]],
+                         max_concurrent: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Call several MCP tools concurrently over this session.
+        
+        ClientSession matches responses to requests by id, so the calls share the
+        one stdio stream and finish in about the time of the slowest. Results are
+        returned in the order of ``calls``.
+        
+        Args:
+            calls: (tool_name, arguments) pairs
+            max_concurrent: Optional cap on calls in flight at once
+        """
+        if max_concurrent is None:
+            return list(await asyncio.gather(*(self.call_tool(name, args) for name, args in calls)))
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def bounded_call(name: str, args: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.call_tool(name, args)
+        
+        return list(await asyncio.gather(*(bounded_call(name, args) for name, args in calls)))
+    
+    async def _call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Call an MCP tool."""
         if not self.session:
             raise RuntimeError("Not connected to MCP server. Call connect() first.")
         
         try:
-            logger.info(f"Calling tool: {tool_name} with arguments: {arguments}")
+            logger.debug("Calling tool: %s with arguments: %s", tool_name, arguments)
             
             result = await self.session.call_tool(tool_name, arguments or {})
             
@@ -89,9 +156,16 @@ class MCPClientWrapper:
                 text_content = result.content[0].text
                 
                 try:
-                    import ast
+                    parsed_result = json_loads(text_content)
+                    logger.debug("Tool %s returned: %s", tool_name, type(parsed_result))
+                    return parsed_result
+                except json.JSONDecodeError:
+                    pass
+                
+                # Older servers returned str(dict) rather than JSON
+                try:
                     parsed_result = ast.literal_eval(text_content)
-                    logger.info(f"Tool {tool_name} returned: {type(parsed_result)}")
+                    logger.debug("Tool %s returned: %s", tool_name, type(parsed_result))
                     return parsed_result
                 except (ValueError, SyntaxError):
                     logger.warning(f"Could not parse tool result as dict: {text_content[:100]}")
@@ -111,13 +185,12 @@ class MCPClientWrapper:
     async def close(self):
         """Close connection to MCP server."""
         try:
-            if self.session:
-                await self.session.__aexit__(None, None, None)
+            if self._stack:
+                await self._stack.aclose()
                 logger.info("Closed MCP session")
-            
-            if self._context:
-                await self._context.__aexit__(None, None, None)
-                logger.info("Closed MCP client context")
                 
         except Exception as e:
             logger.error(f"Error closing MCP connection: {e}", exc_info=True)
+        finally:
+            self._stack = None
+            self.session = None
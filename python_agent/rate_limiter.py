@@ -0,0 +1,44 @@
+"""Async rate limiter for pacing Claude API requests."""
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Token-bucket limiter allowing `max_rate` requests per `time_period` seconds.
+    
+    Bursts up to `max_rate` go through immediately; after that callers are
+    spaced out to the refill rate instead of sleeping a fixed delay per call.
+    
+    Usage:
+        limiter = AsyncRateLimiter(50, 60)
+        async with limiter:
+            await client.messages.create(...)
+    """
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate = max_rate / time_period  # tokens added per second
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Take one token, waiting until it becomes available."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # Reserve the token now so concurrent callers queue up behind us
+            self._tokens -= 1
+            wait_time = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
@@ -1,7 +1,12 @@
 """Setup script to install dependencies and verify configuration."""
 import subprocess
 import sys
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import List, Optional
+
+REQUIREMENTS_FILE = Path("requirements.txt")
+PIP_FLAGS = ["--disable-pip-version-check", "--no-input"]
 
 
 def print_header(text):
@@ -22,12 +27,65 @@ def check_python_version():
     return True
 
 
+def find_missing_requirements(requirements_file: Path) -> Optional[List[str]]:
+    """List requirements that are not installed at a satisfying version.
+    
+    Returns None when the packaging library is unavailable, in which case the
+    installed versions cannot be checked and everything should be installed.
+    """
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return None
+    
+    missing = []
+    for line in requirements_file.read_text().splitlines():
+        spec = line.split("#", 1)[0].strip()
+        if not spec:
+            continue
+        
+        try:
+            req = Requirement(spec)
+        except InvalidRequirement:
+            # pip options (-r, -e) and URLs can't be checked; let pip handle them
+            missing.append(spec)
+            continue
+        # Skip requirements that do not apply to this platform
+        if req.marker is not None and not req.marker.evaluate():
+            continue
+        
+        try:
+            installed = version(req.name)
+        except PackageNotFoundError:
+            missing.append(spec)
+            continue
+        if not req.specifier.contains(installed, prereleases=True):
+            missing.append(spec)
+    
+    return missing
+
+
 def install_dependencies():
-    """Install required packages."""
-    print("\nInstalling dependencies...")
+    """Install required packages that are missing or out of date."""
+    print("\nChecking dependencies...")
+    missing = find_missing_requirements(REQUIREMENTS_FILE)
+    if missing == []:
+        print("✓ All dependencies already installed")
+        return True
+    
+    if missing is None:
+        print("Installing dependencies...")
+        args = ["-r", str(REQUIREMENTS_FILE)]
+    else:
+        print(f"Installing {len(missing)} missing dependencies: {', '.join(missing)}")
+        # Option lines such as "-r other.txt" are two arguments to pip
+        args = []
+        for spec in missing:
+            args.extend(spec.split(None, 1) if spec.startswith("-") else [spec])
+    
     try:
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+            [sys.executable, "-m", "pip", "install", *PIP_FLAGS, *args],
             check=True
         )
         print("✓ Dependencies installed successfully")
@@ -38,7 +96,7 @@ def install_dependencies():
 
 
 def check_env_file():
-    """Check if .env file exists."""
+    """Check that .env exists and sets CLAUDE_API_KEY."""
     print("\nChecking environment configuration...")
     env_file = Path(".env")
     
@@ -57,12 +115,18 @@ def check_env_file():
             print("❌ .env.example not found")
             return False
     
-    with open(env_file) as f:
-        content = f.read()
-        if "your-claude-api-key-here" in content or "CLAUDE_API_KEY=" in content and not "CLAUDE_API_KEY=sk-" in content:
-            print("⚠️  CLAUDE_API_KEY not configured in .env")
-            print("   Please edit .env and add your API key")
-            return False
+    api_key = None
+    for line in env_file.read_text().splitlines():
+        line = line.strip()
+        if line.startswith("CLAUDE_API_KEY="):
+            api_key = line.split("=", 1)[1].strip().strip("\"'")
+            break
+    
+    # Anything but an sk- key (including the .env.example placeholder) is unset
+    if api_key is None or not api_key.startswith("sk-"):
+        print("⚠️  CLAUDE_API_KEY not configured in .env")
+        print("   Please edit .env and add your API key")
+        return False
     
     print("✓ Environment configuration found")
     return True